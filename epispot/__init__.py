@@ -28,14 +28,11 @@ def dependency_check():
 
 
 # imports
-import random
+import importlib
 import warnings
 
 # dependencies
-import dill
 import numpy as np
-from matplotlib import colors
-from matplotlib import pyplot as plt
 
 
 # helper funcs
@@ -58,6 +55,28 @@ def _check_updates():
 
 
 # global funcs
+_rng = None  # set by `epispot.seed`
+
+
+def _standard_normal():
+    """Draw the random noise used by `epispot.params` and `epispot.estimates`"""
+    if _rng is None:
+        return np.random.standard_normal()  # follows `numpy.random.seed`
+    return _rng.standard_normal()
+
+def seed(s=None):
+    """
+    Seed the random number generator used for the random noise in `epispot.params` and `epispot.estimates`.
+    Until this is called, noise is drawn from NumPy's global random state (see `numpy.random.seed`).
+
+    ## Parameters
+
+    `s=None (|int)`: Seed; if `None`, fresh entropy is pulled from the operating system
+
+    """
+    global _rng
+    _rng = np.random.default_rng(s)
+
 def sanity_check():
     """
     Sanity check to check for basic installation errors,
@@ -128,7 +147,21 @@ Build stability:
 
 
 # local
-from . import analysis, comps, estimates, models, params, plots, pre
+_submodules = {'analysis', 'comps', 'estimates', 'models', 'params', 'plots', 'pre'}
+
+
+def __getattr__(name):
+    """Import subpackages and modules on first access (PEP 562)"""
+    if name in _submodules:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    """List attributes, including subpackages that have not been imported yet"""
+    return sorted(set(globals()) | _submodules)
+
 
 # metadata
 source = 'https://www.github.com/epispot/epispot'
@@ -3,8 +3,50 @@ The `epispot.analysis.normalize` module contains various functions intended for
 Raw data must usually be sanitized through one or more of these functions before it can be used for forecasting.
 This is also useful for processing data even without a forecasting model.
 
+Every function accepts either lists or NumPy arrays.
+Lists are returned when lists are passed in; NumPy arrays are returned as-is, without any conversion to and from lists.
+Integer counts are always accumulated as `int64`; floating-point data is left as is.
+Two-dimensional arrays (e.g. of shape `(regions, timesteps)`) are treated as a batch of series along the last axis,
+so many regions can be normalized in a single call.
+
 """
 
+from . import np
+
+
+def _like(result, data):
+    """Return `result` as a NumPy array if `data` is one, otherwise as a list"""
+    return result if isinstance(data, np.ndarray) else result.tolist()
+
+def _counts(data):
+    """Convert counts to an array, widening integers to `int64` so that long series can't overflow"""
+    data = np.asarray(data)
+    if data.dtype.kind in 'biu':
+        return data.astype(np.int64, copy=False)
+    return data
+
+def _active(deltas, period, delay):
+    """Array version of `epispot.analysis.normalize.active`"""
+    # trailing sums as differences of prefix sums: sum(deltas[a:b]) = sums[b] - sums[a]
+    sums = np.cumsum(_counts(deltas), axis=-1)
+    sums = _prepend(_zero(sums), sums)
+    upper = np.arange(delay + 1, sums.shape[-1])
+    lower = np.maximum(upper - period - 1, 0)
+
+    return sums[..., upper] - sums[..., lower]
+
+def _zero(data):
+    """A single zero (per series) of the same type as `data`, even if `data` is empty"""
+    return np.zeros(data.shape[:-1] + (1,), data.dtype)
+
+def _prepend(first, rest):
+    """Join `first` and `rest` along the time (last) axis"""
+    return np.concatenate((first, rest), axis=-1)
+
+def _outflow(active, deltas):
+    """Number of cases leaving the pool of active cases at every timestep after the first"""
+    return _counts(deltas)[..., 1:] - np.diff(_counts(active), axis=-1)
+
 def count(cases, percent):
     """
     Under or overcount the number of cases to account for data inaccuracies.
@@ -26,7 +68,7 @@ def count(cases, percent):
     Normalized cases (`list[float]`)
 
     """
-    return [case * (1 + percent) for case in cases]
+    return _like(np.asarray(cases) * (1 + percent), cases)
 
 def active(deltas, period, delay=0):
     """
@@ -51,14 +93,7 @@ def active(deltas, period, delay=0):
     A list of active cases at any given time (`list[int]`)
 
     """
-    active = []
-    for i in range(len(deltas) - delay):
-        if i < period - delay:
-            active.append(sum(deltas[:i + delay + 1]))
-        else:
-            active.append(sum(deltas[i - period + delay:i + delay + 1]))
-
-    return active
+    return _like(_active(deltas, period, delay), deltas)
 
 def cumulative(deltas):
     """
@@ -74,7 +109,7 @@ def cumulative(deltas):
     A list of cumulative cases (`list[int]`)
 
     """
-    return [sum(deltas[:i + 1]) for i, _ in enumerate(deltas)]
+    return _like(np.cumsum(_counts(deltas), axis=-1), deltas)
 
 def deltas(cumulative):
     """
@@ -90,11 +125,7 @@ def deltas(cumulative):
     A list of new cases per day (`list[int]`)
 
     """
-    out = [cumulative[0]]
-    for i in range(1, len(cumulative)):
-        out.append(cumulative[i] - cumulative[i - 1])
-
-    return out
+    return _like(np.diff(_counts(cumulative), axis=-1, prepend=0), cumulative)
 
 def shift(count, delay):
     """
@@ -115,6 +146,8 @@ def shift(count, delay):
     A list of shifted counts (`list[int]`)
 
     """
+    if isinstance(count, np.ndarray):
+        return count[..., delay:]
     return count[delay:]
 
 def bound(active, deltas, deaths):
@@ -140,17 +173,10 @@ def bound(active, deltas, deaths):
     A list of bounded new deaths per day (`list[int]`)
 
     """
-    bounded = []
-    for i, death in enumerate(deaths):
-        if i == 0:
-            bounded.append(death)
-        else:
-            bounded.append(min(
-                death,
-                -(active[i] - active[i - 1] - deltas[i])
-            ))
+    counts = _counts(deaths)
+    bounded = np.minimum(counts[..., 1:], _outflow(active, deltas))
 
-    return bounded
+    return _like(_prepend(counts[..., :1], bounded), deaths)
 
 def recovered(active, deltas, deaths):
     """
@@ -178,8 +204,42 @@ def recovered(active, deltas, deaths):
         and thus the number of recovering individuals.
 
     """
-    recovered = [0]
-    for i in range(1, len(active)):
-        recovered.append(-(active[i] - active[i - 1] - deltas[i]) - deaths[i])
+    recovered = _outflow(active, deltas) - _counts(deaths)[..., 1:]
+
+    return _like(_prepend(_zero(recovered), recovered), deaths)
+
+def pipeline(deltas, deaths, period, delay=0):
+    """
+    Compute active cases, bounded deaths, and recoveries from raw data in one pass.
+    This is equivalent to calling `epispot.analysis.normalize.active`,
+    `epispot.analysis.normalize.bound`, and `epispot.analysis.normalize.recovered` in sequence
+    (with `deltas` and `deaths` shifted by `delay`),
+    but shares intermediate results and skips the conversions to and from lists.
+
+    ## Parameters
+
+    `deltas (list[int])`: The list of new cases per day.
+
+    `deaths (list[int])`: The list of new deaths per day.
+
+    `period (int)`: The average period of infectiousness.
+
+    `delay=0 (int)`: The average delay before tests are administered to those infected with the disease.
+
+    ## Returns
+
+    Active cases, bounded new deaths, and new recovered cases per day,
+    each `delay` timesteps shorter than `deltas`
+    (`tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray)`)
+
+    """
+    deltas = _counts(deltas)
+    deaths = _counts(deaths)[..., delay:]
+
+    active = _active(deltas, period, delay)
+    outflow = _outflow(active, deltas[..., delay:])
+    bounded = _prepend(deaths[..., :1], np.minimum(deaths[..., 1:], outflow))
+    recovered = outflow - bounded[..., 1:]
+    recovered = _prepend(_zero(recovered), recovered)
 
-    return recovered
+    return active, bounded, recovered
@@ -11,6 +11,108 @@ __pdoc__ = {}
 __pdoc__['Compartment._base_check'] = True
 
 
+def _transfer(system, pos, connections, derivs, output, repeated=True):
+    """
+    Move `derivs` out of compartment `pos` and into each of its `connections` (adding to `output`),
+    clamping them (in place) so that no compartment population becomes negative;
+    `repeated` indicates whether any connection appears more than once
+    """
+    if len(connections) == 1:
+        # scalar fast path for the common single-connection case
+        # (NumPy's per-call overhead dwarfs the arithmetic here)
+        # (inline comparisons are cheaper than the `max`/`min` builtins)
+        connection = connections[0]
+        deriv, lower, upper = derivs[0], -system[connection], system[pos]
+        if deriv < lower:
+            deriv = lower
+        if deriv > upper:
+            deriv = upper
+        output[connection] += deriv
+        output[pos] -= deriv
+        return output
+
+    # ensure compartment populations are non-negative
+    np.maximum(derivs, -system[connections], out=derivs)
+    np.minimum(derivs, system[pos], out=derivs)
+
+    # fancy indexing would drop all but one of any repeated connections
+    if repeated:
+        output += np.bincount(connections, derivs, len(output))
+    else:
+        output[connections] += derivs
+    output[pos] -= derivs.sum()
+
+    return output
+
+def _parameters(time, minimap, minimatrix):
+    """Probabilities and rates of every connection at `time` (as two arrays), read directly from `minimatrix`"""
+    probabilities, rates = [], []
+    for connection in minimap:
+        probability, rate = minimatrix[connection][:2]
+        probabilities.append(probability(time) if callable(probability) else probability)
+        rates.append(rate(time) if callable(rate) else rate)
+
+    return np.array(probabilities, dtype=float), np.array(rates, dtype=float)
+
+def _triage(system, pos, maximum_capacity, triage_index):
+    """Move everyone above `maximum_capacity` out of compartment `pos` and into `triage_index`"""
+    if (maximum_capacity is not None) and \
+       (system[pos] > maximum_capacity):
+        system[triage_index] += system[pos] - maximum_capacity
+        system[pos] = maximum_capacity
+
+    return system
+
+
+class _Connections:
+    """
+    One compartment's connection parameters, cached by a compiled `epispot.models.Model` ahead of integration
+    and split into constants and time-dependent functions so that they are not re-read on every step.
+    These are kept by the model (rather than the compartment), since a compartment can be used in several models.
+    """
+
+    def __init__(self, minimap, minimatrix):
+        """
+        Cache the connection parameters.
+
+        ## Parameters
+
+        `minimap (list[int])`: The compartment's connections.
+
+        `minimatrix (list[tuple(float|func(t: float)->float, float|func(t: float)->float)])`: A slice of the `matrix` parameter of `epispot.models.Model` specific to the compartment.
+
+        """
+        self.connections = np.array(minimap, dtype=np.intp)
+        self.connections.setflags(write=False)  # also used by `epispot.models._Network`
+        self.repeated = len(set(minimap)) < len(minimap)
+
+        # probabilities and rates of every connection, stored as separate contiguous arrays;
+        # functions are evaluated in `parameters`
+        parameters = [minimatrix[connection][:2] for connection in minimap]
+        self.probabilities = np.array(
+            [0.0 if callable(probability) else probability for probability, _ in parameters],
+            dtype=float
+        )
+        self.rates = np.array(
+            [0.0 if callable(rate) else rate for _, rate in parameters],
+            dtype=float
+        )
+        self.dynamic = [(i, j, value)
+                        for i, pair in enumerate(parameters)
+                        for j, value in enumerate(pair) if callable(value)]
+
+    def parameters(self, time):
+        """Probabilities and rates of every connection at `time` (as two arrays)"""
+        # initialize time-dependent parameters
+        parameters = (self.probabilities, self.rates)
+        if self.dynamic:
+            parameters = tuple(column.copy() for column in parameters)
+            for i, j, function in self.dynamic:
+                parameters[j][i] = function(time)
+
+        return parameters
+
+
 class Compartment:
     """
     This class represents a compartment, used in compartmental models.
@@ -86,8 +188,7 @@ class Compartment:
 
     def _check_config(self):
         """Configuration dictionary checker"""
-        if 'type' not in self.config.keys():
-            self.config['type'] = None
+        self.config.setdefault('type', None)
 
     def _base_check(self, valid_compartments, minimap, compartments):
         """
@@ -120,24 +221,30 @@ class Compartment:
         `True` if no errors have been raised.
 
         """
+        valid_compartments = tuple(valid_compartments)
         for compartment_no in minimap:
 
             compartment = compartments[compartment_no]
-            valid = False
-
-            for valid_compartment in valid_compartments:
-                if isinstance(compartment, valid_compartment):
-                    valid = True
 
-            if not valid:  # pragma: no cover
+            if not isinstance(compartment, valid_compartments):  # pragma: no cover
                 raise ValueError(f'Invalid compartment {compartment} '
                                  f'found connected to compartment '
                                  f'{self.name}.')
 
         return True
 
+    def _diff(self, time, system, pos, output, cache):
+        """Equivalent to `epispot.comps.Compartment.diff`, using the connection parameters in `cache` (a `_Connections` object)"""
+        probabilities, rates = cache.parameters(time)
+
+        # evaluate compartment derivatives
+        derivs = probabilities * rates * system[pos]
+
+        return _transfer(system, pos, cache.connections, derivs, output,
+                         cache.repeated)
+
     @staticmethod
-    def diff(time, system, pos, minimap, minimatrix):
+    def diff(time, system, pos, minimap, minimatrix, output=None):
         """
         Calculate the derivative of the compartment with respect to
         time.
@@ -157,37 +264,23 @@ class Compartment:
 
         `minimatrix (list[tuple(float|func(t: float)->float, float|func(t: float)->float)])`: A slice of the `matrix` parameter of `epispot.models.Model` specific to this compartment.
 
+        `output=None (|numpy.ndarray)`: Array to add the derivative to (in place), instead of a new array of zeros.
+            `epispot.models.Model.diff` uses this to accumulate all compartment derivatives in one array.
+
         ## Returns
 
         Derivative of the entire system calculated by the compartment (`list[float]`)
 
         """
-        output = np.zeros(system.shape)
-        for connection in minimap:
+        if output is None:
+            output = np.zeros(system.shape)
+        probabilities, rates = _parameters(time, minimap, minimatrix)
 
-            # initialize parameters
-            probability = minimatrix[connection][0]
-            rate = minimatrix[connection][1]
+        # evaluate compartment derivatives
+        derivs = probabilities * rates * system[pos]
 
-            # initialize time-dependent parameters
-            if callable(probability):
-                probability = probability(time)
-            if callable(rate):
-                rate = rate(time)
-
-            # evaluate compartment derivative
-            deriv = probability * rate * system[pos]
-
-            # ensure compartment populations are non-negative
-            min_connection_deriv = -system[connection]
-            max_pos_deriv = system[pos]
-            deriv = max(deriv, min_connection_deriv)
-            deriv = min(deriv, max_pos_deriv)
-
-            output[connection] += deriv
-            output[pos] -= deriv
-
-        return output
+        return _transfer(system, pos, np.asarray(minimap, dtype=np.intp), derivs,
+                         output, len(set(minimap)) < len(minimap))
 
 
 class Susceptible(Compartment):
@@ -237,7 +330,38 @@ class Susceptible(Compartment):
                              'exactly one connection to either the '
                              'Infected or Exposed compartment.')
 
-    def diff(self, time, system, pos, minimap, minimatrix, infecteds=None):
+    def _infections(self, time, system, pos, total_infecteds):
+        """
+        New infections per unit time (`r_0 * gamma * S * I / N`), before connection probabilities and rates;
+        `total_infecteds` is passed in so that a model with several Susceptible compartments only sums it once
+        """
+        # initialize parameters
+        r_0 = self.r_0
+        gamma = self.gamma
+        n = self.n
+
+        # initialize time-dependent parameters
+        if callable(r_0):
+            r_0 = r_0(time)
+        if callable(gamma):
+            gamma = gamma(time)
+        if callable(n):
+            n = n(time)
+
+        return r_0 * gamma * system[pos] * total_infecteds / n
+
+    def _diff(self, time, system, pos, output, cache, infecteds):
+        """Equivalent to `epispot.comps.Susceptible.diff`, using the connection parameters in `cache` (a `_Connections` object)"""
+        probabilities, rates = cache.parameters(time)
+        total_infecteds = system[infecteds].sum(dtype=float)  # accumulated in double precision
+        derivs = self._infections(time, system, pos, total_infecteds)
+        derivs = derivs * (probabilities * rates)
+
+        return _transfer(system, pos, cache.connections, derivs, output,
+                         cache.repeated)
+
+    def diff(self, time, system, pos, minimap, minimatrix, infecteds=None,
+             output=None):
         """
         Calculate the derivative of the compartment with respect to
         time.
@@ -257,9 +381,11 @@ class Susceptible(Compartment):
 
         `minimatrix (list[tuple(float|func(t: float)->float, float|func(t: float)->float)])`: A slice of the `matrix` parameter of `epispot.models.Model` specific to this compartment.
 
-        `infecteds (list[int])`: A list of the indices of the Infected compartments
+        `infecteds (list[int]|numpy.ndarray)`: A list of the indices of the Infected compartments
             (those with `'type'='Infected'`) in the `config` parameter of `epispot.comps.Compartment`).
 
+        `output=None (|numpy.ndarray)`: Array to add the derivative to (in place), instead of a new array of zeros.
+
         ## Returns
 
         Derivative of the entire system calculated by the compartment (`list[float]`)
@@ -267,43 +393,17 @@ class Susceptible(Compartment):
         """
         if infecteds is None:
             infecteds = []
-        output = np.zeros(system.shape)
+        if output is None:
+            output = np.zeros(system.shape)
 
-        # initialize parameters
-        r_0 = self.r_0
-        gamma = self.gamma
-        n = self.n
+        # evaluate compartment derivatives
+        probabilities, rates = _parameters(time, minimap, minimatrix)
+        total_infecteds = system[infecteds].sum(dtype=float)  # accumulated in double precision
+        derivs = self._infections(time, system, pos, total_infecteds)
+        derivs = derivs * (probabilities * rates)
 
-        # initialize time-dependent parameters
-        if callable(r_0):
-            r_0 = r_0(time)
-        if callable(gamma):
-            gamma = gamma(time)
-        if callable(n):
-            n = n(time)
-
-        # get total number of infecteds
-        total_infecteds = 0
-        for i in infecteds:
-            total_infecteds += system[i]
-
-        for connection in minimap:
-
-            # evaluate compartment derivative
-            deriv = r_0 * gamma * system[pos] * total_infecteds / n
-            deriv *= minimatrix[connection][0] * minimatrix[connection][1]
-
-            # ensure compartment populations are non-negative
-            min_connection_deriv = -system[connection]
-            max_pos_deriv = system[pos]
-            deriv = max(deriv, min_connection_deriv)
-            deriv = min(deriv, max_pos_deriv)
-
-            # apply derivative
-            output[connection] += deriv
-            output[pos] -= deriv
-
-        return output
+        return _transfer(system, pos, np.asarray(minimap, dtype=np.intp), derivs,
+                         output, len(set(minimap)) < len(minimap))
 
 
 class Infected(Compartment):
@@ -467,67 +567,24 @@ class Hospitalized(Compartment):
         self._base_check([Critical, Recovered, Removed, Dead], minimap,
                          compartments)
 
-    def diff(self, time, system, pos, minimap, minimatrix):
+    def project(self, system, pos):
         """
-        Calculate the derivative of the compartment with respect to
-        time.
-
-        ## **Parameters**
-
-        `time`: Time to take the derivative at. Similar to `time`
-                parameter in `epispot.models.Model.diff`.
+        Enforce triage after an integration step:
+        any individuals above the maximum capacity are moved (in place) to the compartment at the triage index.
+        `epispot.models.Model.integrate` calls this once per step.
 
-        `system`: A list containing the system of compartment values.
-                  Should be of the same shape as the `starting_state`
-                  parameter of `epispot.models.Model.integrate`.
-
-        `pos`: The index of the compartment in the `comps` parameter of
-               `epispot.models.Model`.
+        ## Parameters
 
-        `minimap`: This compartment's connections. Essentially, a slice
-                   of the larger `map` parameter of
-                   `epispot.models.Model`.
+        `system (numpy.ndarray)`: The system of compartment values after the step.
 
-        `minimatrix`: A slice of the `matrix` parameter of
-                      `epispot.models.Model` specific to this
-                      compartment.
+        `pos (int)`: The index of the compartment in the `comps` parameter of `epispot.models.Model`.
 
-        ## **Returns**
+        ## Returns
 
-        The compartment derivative
+        The projected system (`numpy.ndarray`)
 
         """
-        output = np.zeros(system.shape)
-        for connection in minimap:
-
-            # initialize parameters
-            probability = minimatrix[connection][0]
-            rate = minimatrix[connection][1]
-
-            # initialize time-dependent parameters
-            if callable(probability):
-                probability = probability(time)
-            if callable(rate):
-                rate = rate(time)
-
-            # evaluate compartment derivative
-            deriv = probability * rate * system[pos]
-
-            # ensure compartment populations are non-negative
-            min_connection_deriv = -system[connection]
-            max_pos_deriv = system[pos]
-            deriv = max(deriv, min_connection_deriv)
-            deriv = min(deriv, max_pos_deriv)
-
-            output[connection] += deriv
-            output[pos] -= deriv
-
-        if (self.maximum_capacity is not None) and \
-           (system[pos] > self.maximum_capacity):
-            output[pos] = self.maximum_capacity - system[pos]
-            output[self.triage_index] = -output[pos]
-
-        return output
+        return _triage(system, pos, self.maximum_capacity, self.triage_index)
 
 
 class Critical(Compartment):
@@ -576,36 +633,6 @@ class Critical(Compartment):
         """Check wrapper for the Hospitalized compartment"""
         self._base_check([Recovered, Removed, Dead], minimap, compartments)
 
-    def diff(self, time, system, pos, minimap, minimatrix):
-
-        output = np.zeros(system.shape)
-        for connection in minimap:
-
-            # initialize parameters
-            probability = minimatrix[connection][0]
-            rate = minimatrix[connection][1]
-
-            # initialize time-dependent parameters
-            if callable(probability):
-                probability = probability(time)
-            if callable(rate):
-                rate = rate(time)
-
-            # evaluate compartment derivative
-            deriv = probability * rate * system[pos]
-
-            # ensure compartment populations are non-negative
-            min_connection_deriv = -system[connection]
-            max_pos_deriv = system[pos]
-            deriv = max(deriv, min_connection_deriv)
-            deriv = min(deriv, max_pos_deriv)
-
-            output[connection] += deriv
-            output[pos] -= deriv
-
-        if (self.maximum_capacity is not None) and \
-           (system[pos] > self.maximum_capacity):
-            output[pos] = self.maximum_capacity - system[pos]
-            output[self.triage_index] = -output[pos]
-
-        return output
+    def project(self, system, pos):
+        """Enforce triage after an integration step (see `epispot.comps.Hospitalized.project`)"""
+        return _triage(system, pos, self.maximum_capacity, self.triage_index)
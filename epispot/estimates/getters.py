@@ -9,6 +9,30 @@ Alternatively, the data can be loaded directly from `epispot.estimates.data`.
 from . import storage
 
 
+# helpers
+_index = {}  # disease ID → position of the first disease with that ID in `storage.bulk`
+
+
+def _disease(id):
+    """Returns the first disease in `storage.bulk` with ID `id` (or `None`), rebuilding `_index` if `bulk` has changed"""
+    bulk = storage.bulk
+    position = _index.get(id)
+    if position is None or position >= len(bulk) or bulk[position].id != id:
+        _index.clear()
+        for position, disease in enumerate(bulk):
+            _index.setdefault(disease.id, position)
+        position = _index.get(id)
+
+    return None if position is None else bulk[position]
+
+def _first(items, attribute, value):
+    """Returns the first item whose `attribute` equals `value` (or `None`)"""
+    return next(
+        (item for item in items if getattr(item, attribute) == value),
+        None
+    )
+
+
 # querying
 def query(match):
     """
@@ -48,30 +72,12 @@ def query(match):
     # convert to list if not already
     if isinstance(match, str): match = match.split('/')
 
-    # helper functions
-    def query_params(data):
-        for param in data:
-            if param.id == match[2]:
-                return param
-
-    def query_papers(data):
-        for paper in data:
-            if paper.in_text == match[1]:
-                if len(match) == 2:
-                    return paper
-                else:
-                    return query_params(paper.params)
-
-    def query_diseases(data):
-        for disease in storage.bulk:
-            if disease.id == match[0]:
-                if len(match) == 1:
-                    return disease
-                else:
-                    return query_papers(disease.papers)
-
     # search for match
-    queried = query_diseases(storage.bulk)
+    queried = _disease(match[0])
+    if queried is not None and len(match) > 1:
+        queried = _first(queried.papers, 'in_text', match[1])
+    if queried is not None and len(match) > 2:
+        queried = _first(queried.params, 'id', match[2])
     if queried is None:  # pragma: no cover
         raise ValueError(
             f'No match found for {match}; try a different query or '
@@ -5,6 +5,7 @@ It can also be used to import estimates that epispot does not already have.
 """
 
 # imports
+from .. import _standard_normal
 from . import np, storage
 
 
@@ -167,6 +168,7 @@ class Estimate:
 
         `z=0 (float)`: Amount of random noise to add to the distribution.
             *Magnitude of a uniform distribution (added to final result)*
+            Use `epispot.seed` (or `numpy.random.seed`, if `epispot.seed` has not been called) for reproducible noise.
 
         `**kwargs`: Additional keyword arguments to pass to the
                     distribution.
@@ -213,4 +215,4 @@ class Estimate:
         return self.name + ': ' + self.description
 
     def __call__(self, t, z=0, **kwargs):
-        return self.dist(t, **kwargs) + z * np.random.standard_normal()
+        return self.dist(t, **kwargs) + z * _standard_normal()
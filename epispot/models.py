@@ -6,9 +6,95 @@ Additionally, epispot models are portable—they can be used throughout
 the package to generate plots, run predictions, etc.
 """
 
-from copy import deepcopy
+import inspect
 
-from . import dill, np, version, warnings
+from . import comps, np, version, warnings
+
+
+class _Network:
+    """
+    Every connection of a compiled `epispot.models.Model` flattened into a single edge list,
+    so that the derivative of the whole system takes a handful of array operations instead of one `diff` call per compartment.
+    Only used when every compartment relies on the built-in `epispot.comps.Compartment.diff` or `epispot.comps.Susceptible.diff`.
+    """
+
+    def __init__(self, compartments, caches, infecteds):
+        """
+        Build the edge list from the connection parameters cached by `epispot.models.Model.compile`.
+
+        ## Parameters
+
+        `compartments (list[epispot.comps.Compartment])`: The compartments of the model
+
+        `caches (list[epispot.comps._Connections])`: The connection parameters of every compartment
+
+        `infecteds (numpy.ndarray)`: Indices of the Infected compartments
+
+        """
+        sources, targets, probabilities, rates = [], [], [], []
+        self.dynamic = []  # time-dependent parameters, in compartment order
+        self.susceptibles = []
+
+        for pos, (compartment, cache) in enumerate(zip(compartments, caches)):
+            start = len(targets)
+            sources += [pos] * len(cache.connections)
+            targets += cache.connections.tolist()
+            probabilities += cache.probabilities.tolist()
+            rates += cache.rates.tolist()
+            self.dynamic += [(start + i, j, function)
+                             for i, j, function in cache.dynamic]
+            if isinstance(compartment, comps.Susceptible):
+                edges = slice(start, len(targets))
+                self.susceptibles.append((pos, compartment, edges,
+                                          len(self.dynamic)))
+
+        self.sources = np.array(sources, dtype=np.intp)
+        self.targets = np.array(targets, dtype=np.intp)
+        for indices in (self.sources, self.targets):
+            indices.setflags(write=False)
+        self.probabilities = np.array(probabilities, dtype=float)
+        self.rates = np.array(rates, dtype=float)
+        self.infecteds = infecteds
+        self.size = len(compartments)
+
+    def diff(self, time, system, output):
+        """Add the derivative of the entire system to `output`; equivalent to every compartment's `diff`"""
+        # initialize time-dependent parameters, calling every function in the same order as the compartments' own `diff`
+        # (so that random or stateful parameters give the same results either way)
+        probabilities, rates = self.probabilities, self.rates
+        if self.dynamic:
+            probabilities, rates = probabilities.copy(), rates.copy()
+        columns, dynamic = (probabilities, rates), self.dynamic
+        if self.susceptibles:
+            # shared by every Susceptible compartment (accumulated in double precision)
+            total_infecteds = system[self.infecteds].sum(dtype=float)
+        infections, start = [], 0
+        for pos, compartment, _, stop in self.susceptibles:
+            for i, j, function in dynamic[start:stop]:
+                columns[j][i] = function(time)
+            infections.append(compartment._infections(time, system, pos,
+                                                      total_infecteds))
+            start = stop
+        for i, j, function in dynamic[start:]:
+            columns[j][i] = function(time)
+
+        sources, targets, size = self.sources, self.targets, self.size
+        populations = system[sources]  # population at the source of every connection
+
+        # evaluate the flow along every connection
+        weights = probabilities * rates
+        derivs = weights * populations
+        for (_, _, edges, _), infection in zip(self.susceptibles, infections):
+            derivs[edges] = infection * weights[edges]
+
+        # ensure compartment populations are non-negative
+        np.maximum(derivs, -system[targets], out=derivs)
+        np.minimum(derivs, populations, out=derivs)
+
+        output += np.bincount(targets, derivs, size)
+        output -= np.bincount(sources, derivs, size)
+
+        return output
 
 
 class Model:
@@ -116,6 +202,11 @@ class Model:
         Adding, removing, or modifying compartments after this step will automatically de-compile the model,
         requiring it to be compiled again after changes have been made.
 
+        This step also caches the model's connection parameters (the `matrix`).
+        `epispot.models.Model.integrate` refreshes this cache every time it is called,
+        but `epispot.models.Model.diff` does not;
+        call `epispot.models.Model.refresh` after changing the `matrix` in place before calling `diff` directly.
+
         .. important::
            Only run after all the compartments have been
            added to the model.
@@ -133,6 +224,15 @@ class Model:
             for i, compartment in enumerate(self.compartments):
                 compartment._check(self.map[i], self.compartments)
 
+        self.refresh()
+        self.compiled = True
+
+    def refresh(self):
+        """
+        Re-read the model's connection parameters (the `matrix`), along with everything else `epispot.models.Model.diff` caches.
+        `epispot.models.Model.compile` and `epispot.models.Model.integrate` do this automatically,
+        so this is only needed when calling `epispot.models.Model.diff` directly after changing the `matrix` in place.
+        """
         # aggregate all compartments by type
         self.aggregated = {}
         for i, compartment in enumerate(self.compartments):
@@ -140,9 +240,44 @@ class Model:
                 self.aggregated[compartment.config['type']] = []
             self.aggregated[compartment.config['type']].append(i)
 
-        self.compiled = True
+        # cache the lookups needed on every integration step
+        infecteds = np.asarray(self.aggregated.get('Infected', []),
+                               dtype=np.intp)
+        infecteds.setflags(write=False)
+        self._options = [
+            {'infecteds': infecteds}
+            if compartment.config['type'] == 'Susceptible' else {}
+            for compartment in self.compartments
+        ]
+        # compartments with constraints enforced after every step (e.g. triage)
+        self._projections = [
+            (i, compartment) for i, compartment in enumerate(self.compartments)
+            if hasattr(compartment, 'project')
+        ]
+        # compartments using a built-in derivative, which can read the cached parameters (through `_diff`);
+        # with only built-in derivatives, all connections can be handled at once
+        self._cached = {
+            i for i, compartment in enumerate(self.compartments)
+            if type(compartment).diff in (comps.Compartment.diff, comps.Susceptible.diff)
+        }
+
+        # cache the connection parameters of those compartments (by position);
+        # custom compartments read their own
+        self._caches = [
+            comps._Connections(self.map[i], self.matrix[i]) if i in self._cached else None
+            for i in range(len(self.compartments))
+        ]
+        fusable = len(self._cached) == len(self.compartments)
+        self._network = _Network(self.compartments, self._caches, infecteds) if fusable else None
+
+        # custom compartments that can add their derivative to a shared array
+        # (they may not support `output`)
+        self._accumulate = {
+            i for i, compartment in enumerate(self.compartments)
+            if i not in self._cached and 'output' in inspect.signature(compartment.diff).parameters
+        }
 
-    def diff(self, time, system):
+    def diff(self, time, system, output=None):
         """
         Differentiate `epispot.models.Model`; used by `epispot.models.Model.integrate` for evaluating model predictions.
 
@@ -154,10 +289,17 @@ class Model:
         `system (list[float])`: System of state values (e.g `[973, 12, 15]`).
             This is propagated to each of the individual compartments in the model.
 
+        `output=None (|numpy.ndarray)`: Array to add the derivative to (in place), instead of a new array of zeros.
+            `epispot.models.Model.integrate` uses this to reuse one array for every step.
+
         ## Returns
 
         List of corresponding compartment derivatives (`list[float]`)
 
+        ## Additional Notes
+
+        Connection parameters are cached; after changing the `matrix` in place, call `epispot.models.Model.refresh` first.
+
         """
         if not self.compiled:  # pragma: no cover
             warnings.warn('An epispot model has not been compiled yet. '
@@ -165,25 +307,34 @@ class Model:
                           'compile the model.')
             self.compile()
 
-        derivative = np.zeros((len(self.compartments), ))
+        derivative = output
+        if derivative is None:
+            derivative = np.zeros((len(self.compartments), ))
+
+        if self._network is not None:
+            return self._network.diff(time, system, derivative)
+
+        options = self._options
+        cached = self._cached
+        accumulate = self._accumulate
+
         for num, compartment in enumerate(self.compartments):
-            if num in self.aggregated['Susceptible']:
-                delta = compartment.diff(
-                    time, system, num,
-                    self.map[num], self.matrix[num],
-                    infecteds=self.aggregated['Infected']
-                )
+            if num in cached:
+                compartment._diff(time, system, num, derivative,
+                                  self._caches[num], **options[num])
+            elif num in accumulate:
+                compartment.diff(time, system, num,
+                                 self.map[num], self.matrix[num],
+                                 output=derivative, **options[num])
             else:
-                delta = compartment.diff(time,
-                                         system,
-                                         num,
-                                         self.map[num],
-                                         self.matrix[num])
-            derivative += delta
+                derivative += compartment.diff(time, system, num,
+                                               self.map[num],
+                                               self.matrix[num],
+                                               **options[num])
 
         return derivative
 
-    def integrate(self, timesteps, starting_state=None):
+    def integrate(self, timesteps, starting_state=None, dtype=float):
         """
         Integrate the model using `epispot.models.Model.diff` to arrive at future predictions using
         [Euler's Method](https://en.wikipedia.org/wiki/Euler_method).
@@ -197,30 +348,42 @@ class Model:
         `starting_state=None (|list[int])`: List of initial values for each compartment.
             This is used as the initial vector for the integration process.
             If no `starting_state` is provided, it will default to the having only 1 person in the next non-Susceptible compartment.
+            The starting state is copied, so the list or array passed in is left unchanged.
 
         `delta=1 (|float)`: Δ, the step size for the integration process.
             Smaller values will result in more accurate predictions,
             but will be more costly.
 
+        `dtype=float (|numpy.dtype)`: Data type used to store the system and the results (e.g. `numpy.float32`).
+            Single precision halves the memory used by long integrations;
+            derivatives are still computed in double precision.
+
+        ## Additional Notes
+
+        Connection parameters are read once, at the start of the integration
+        (see `epispot.models.Model.refresh`),
+        so changes made to the `matrix` in between calls are always picked up.
+
         ## Returns
 
-        A list of lists; each sublist is a vector representing the value of each compartment at that specific time.
-        The sublists range according to the `timesteps` parameter.
-        (`list[list[float]]`)
+        A two-dimensional array of shape `(len(timesteps), len(comps))`;
+        each row is a vector representing the value of each compartment at that specific time.
+        The rows range according to the `timesteps` parameter.
+        (`numpy.ndarray`)
 
         ## Example
 
-        For example, the following would be an expected return type for
+        For example, the following would be an expected return value for
         an SIR model with a population of `100`:
 
         ```python
-        [
+        array([
             [99, 1, 0],  # S, I, R on day 1
             [98, 2, 0],  # S, I, R on day 2
             [95, 3, 2],  # S, I, R on day 3
             ...,
             [23, 24, 53]  # final prediction
-        ]
+        ])
         ```
 
         """
@@ -230,27 +393,35 @@ class Model:
                           'Triggering integration will automatically '
                           'compile the model.')
             self.compile()
+        else:
+            self.refresh()  # pick up any parameters changed since the last integration
 
         # initial parameter setup
-        results = []
-
         if starting_state is not None:
-            system = starting_state
+            system = np.array(starting_state, dtype=dtype)
         else:
-            system = np.zeros(len(self.compartments))
+            system = np.zeros(len(self.compartments), dtype=dtype)
             system[0] = self.initial_population - 1
             system[1] = 1
 
         delta = timesteps[1] - timesteps[0]
 
-        for timestep in timesteps:
+        # store the trajectory in one contiguous (time, compartment) array
+        results = np.empty((len(timesteps), len(system)), dtype=dtype)
+        derivatives = np.empty(len(system))  # reused by every step
+
+        for step, timestep in enumerate(timesteps):
 
             # calculate the derivative for each compartment at this
             # timestep and update the system accordingly
 
-            derivatives = self.diff(timestep, system)
-            system += delta * derivatives
-            results.append(deepcopy(system))
+            derivatives.fill(0)
+            self.diff(timestep, system, output=derivatives)
+            derivatives *= delta
+            system += derivatives
+            for pos, compartment in self._projections:
+                compartment.project(system, pos)
+            results[step] = system
 
         return results
 
@@ -335,6 +506,8 @@ class Model:
             raise ValueError('Model has not been compiled yet. '
                              'Cannot save model.')
 
+        import dill  # only needed for (de)serialization
+
         with open(filename, 'wb') as f:
             dill.dump(self, f)
 
@@ -360,14 +533,20 @@ class Model:
           `FileNotFoundError`.
 
         """
+        import dill  # only needed for (de)serialization
+
         with open(filename, 'rb') as f:
             loaded = dill.load(f)
-            if not loaded.compiled:  # pragma: no cover
-                loaded.compile()
             if loaded.version != version:  # pragma: no cover
                 warnings.warn(
                     'This model has been imported from an '
                     f'older version of epispot v{loaded.version}. '
                     f'You have epispot v{version}.'
                 )
+            if not loaded.compiled:  # pragma: no cover
+                loaded.compile()
+            else:
+                # caches are not part of the saved model's interface;
+                # files saved by other versions of epispot may lack them
+                loaded.refresh()
             return loaded
@@ -12,7 +12,7 @@ but the underlying structure is similar to `epispot.params.Distribution`.
 
 """
 
-from . import np
+from . import _standard_normal, np
 
 
 class Distribution:
@@ -31,6 +31,7 @@ class Distribution:
 
         `z=0 (float)`: Amount of random noise to add to the distribution.
             *Magnitude of a uniform distribution (added to final result)*
+            Use `epispot.seed` (or `numpy.random.seed`, if `epispot.seed` has not been called) for reproducible noise.
 
         `**kwargs`: Additional keyword arguments to pass to the
                     distribution.
@@ -77,7 +78,7 @@ class Distribution:
         return self.description
 
     def __call__(self, t, z=0, **kwargs):
-        return self.dist(t, **kwargs) + z * np.random.standard_normal()
+        return self.dist(t, **kwargs) + z * _standard_normal()
 
 
 class Gamma(Distribution):
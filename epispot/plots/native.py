@@ -67,19 +67,13 @@ def model(model, time_frame, title='Compartment Populations over Time',
     if latex:
         plt.style.use('science')
 
-    data_frame = {}
     system = model.integrate(time_frame, **kwargs)
 
     # variable substitutions
     names = model.names
 
-    # setup
-    for name in model.names:
-        data_frame[name] = []
-
-    for day in system:
-        for i, compartment in enumerate(day):
-            data_frame[model.names[i]].append(compartment)
+    # setup (one column of the integrated system per compartment)
+    data_frame = dict(zip(names, system.T))
 
     # plotting
     plt.figure(figsize=(9, 5))
@@ -145,7 +139,6 @@ def stacked(model, time_frame, title='Compartment Populations over Time',
     if latex:
         plt.style.use('science')
 
-    data_frame = {}
     system = model.integrate(time_frame, **kwargs)
 
     # variable substitutions
@@ -154,13 +147,8 @@ def stacked(model, time_frame, title='Compartment Populations over Time',
 
     names = model.names
 
-    # setup
-    for name in model.names:
-        data_frame[name] = []
-
-    for day in system:
-        for i, compartment in enumerate(day):
-            data_frame[model.names[i]].append(compartment)
+    # setup (one column of the integrated system per compartment)
+    data_frame = dict(zip(names, system.T))
 
     if not show_susceptible:
         for i, compartment in enumerate(compartments):
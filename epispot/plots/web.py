@@ -53,19 +53,13 @@ def model(model, time_frame, title='Compartment Populations over Time',
 
     """
 
-    data_frame = {}
     system = model.integrate(time_frame, **kwargs)
 
     # variable substitutions
     names = model.names
 
-    # setup
-    for name in names:
-        data_frame[name] = []
-
-    for day in system:
-        for i, compartment in enumerate(day):
-            data_frame[names[i]].append(compartment)
+    # setup (one column of the integrated system per compartment)
+    data_frame = dict(zip(names, system.T))
 
     if not show_susceptible:
         del data_frame[names[0]]
@@ -143,19 +137,13 @@ def stacked(model, time_frame, title='Compartment Populations over Time',
 
     """
 
-    data_frame = {}
     system = model.integrate(time_frame, **kwargs)
 
     # variable substitutions
     names = model.names
 
-    # setup
-    for name in names:
-        data_frame[name] = []
-
-    for day in system:
-        for i, compartment in enumerate(day):
-            data_frame[names[i]].append(compartment)
+    # setup (one column of the integrated system per compartment)
+    data_frame = dict(zip(names, system.T))
 
     if not show_susceptible:
         del data_frame[names[0]]
@@ -9,7 +9,16 @@ STRUCTURE:
     └ gamma
 └ TESTS
     ├ SIRS
-    └ SIHCR
+    ├ SIHCR
+    ├ triage
+    ├ noise
+    ├ update
+    ├ reproduction
+    ├ custom
+    ├ repeated
+    ├ precision
+    ├ shared
+    └ parameters
 """
 
 import numpy as np
@@ -103,3 +112,227 @@ def test_sihcr():
         predicted,
         np.array([2.115e5, 1.000e2, 1.000e2, 5.000e2, 7.877e5])
     )
+
+def test_triage():
+    """
+    Hospital capacity with triage:
+
+    Susceptible → Infected → Hospitalized → Removed
+    (overflow from Hospitalized is sent straight to Removed)
+
+    """
+    # params
+    n = 1e6
+    capacity = 2e4
+
+    # compile compartments
+    susceptible = epi.comps.Susceptible(r_0, gamma, n)
+    infected = epi.comps.Infected()
+    hospitalized = epi.comps.Hospitalized(max_cap=capacity, index=3)
+    removed = epi.comps.Removed()
+
+    # compile parameters
+    matrix = np.empty((4, 4), dtype=tuple)
+    matrix.fill((1.0, 1.0))  # default probability and rate
+    matrix[1][2] = (0.5, gamma)     # I => H
+    matrix[1][3] = (0.5, gamma)     # I => R
+    matrix[2][3] = (1.0, 0.1)       # H => R
+
+    # compile model
+    triage_model = epi.models.Model(n)
+    triage_model.add(susceptible, [1], matrix[0])
+    triage_model.add(infected, [2, 3], matrix[1])
+    triage_model.add(hospitalized, [3], matrix[2])
+    triage_model.add(removed, [], matrix[3])
+    triage_model.compile()
+
+    # get solutions
+    solution = triage_model.integrate(np.linspace(0, 40, 200))
+    assert solution[:, 2].max() == capacity
+    assert np.allclose(solution.sum(axis=1), n)
+
+def test_noise():
+    """Seeded random noise in parameter distributions"""
+    np.random.seed(42)  # used until `epi.seed` is called
+    first = [r_0(t, z=0.1) for t in range(5)]
+    np.random.seed(42)
+    assert [r_0(t, z=0.1) for t in range(5)] == first
+
+    epi.seed(42)
+    first = [r_0(t, z=0.1) for t in range(5)]
+    epi.seed(42)
+    assert [r_0(t, z=0.1) for t in range(5)] == first
+    assert r_0(0, z=0.1) != r_0(0, z=0.1)
+    assert r_0(3) == r_0(3, z=0)
+
+def test_update():
+    """Changing connection parameters after compiling"""
+    # params
+    n = 1e6
+
+    # compile model
+    susceptible = epi.comps.Susceptible(r_0, gamma, n)
+    infected = epi.comps.Infected()
+    removed = epi.comps.Removed()
+
+    matrix = np.empty((3, 3), dtype=tuple)
+    matrix.fill((1.0, 1.0))  # default probability and rate
+    matrix[1][2] = (1.0, gamma)  # I => R
+
+    sir_model = epi.models.Model(n)
+    sir_model.add(susceptible, [1], matrix[0])
+    sir_model.add(infected, [2], matrix[1])
+    sir_model.add(removed, [], matrix[2])
+    sir_model.compile()
+
+    # change the recovery rate in place
+    before = sir_model.integrate(range(50))
+    sir_model.matrix[1][2] = (1.0, 0.9)
+    after = sir_model.integrate(range(50))
+    assert not np.allclose(before, after)
+
+    # derivatives use the new parameters once the model is refreshed
+    system = np.array([9e5, 5e4, 5e4])
+    sir_model.matrix[1][2] = (1.0, 0.5)
+    sir_model.refresh()
+    assert np.allclose(sir_model.diff(0, system)[2], 2.5e4)
+
+    # compartment derivatives read the parameters they are given
+    assert np.allclose(
+        epi.comps.Compartment.diff(0, system, 1, [2], sir_model.matrix[1]),
+        [0, -2.5e4, 2.5e4]
+    )
+
+def test_reproduction():
+    """Changing the basic reproduction number after compiling"""
+    sir_model = epi.pre.sir(2.5, 0.2, 1e6)
+    system = np.array([9e5, 5e4, 5e4])
+    before = sir_model.integrate(range(50))
+    diff = sir_model.diff(0, system)
+
+    sir_model.compartments[0].r_0 = 1.2
+    assert np.isclose(sir_model.diff(0, system)[0], diff[0] * 1.2 / 2.5)
+    assert not np.allclose(before, sir_model.integrate(range(50)))
+
+def test_custom():
+    """Noisy parameters with and without custom compartments"""
+    noisy_gamma = lambda t: gamma(t, z=0.01)
+
+    class Custom(epi.comps.Removed):
+        def diff(self, time, system, pos, minimap, minimatrix):
+            return epi.comps.Compartment.diff(time, system, pos, minimap,
+                                              minimatrix)
+
+    solutions = []
+    for removed in (epi.comps.Removed(), Custom()):
+        # compile model
+        susceptible = epi.comps.Susceptible(r_0, noisy_gamma, 1e6)
+        infected = epi.comps.Infected()
+
+        matrix = np.empty((3, 3), dtype=tuple)
+        matrix.fill((1.0, 1.0))  # default probability and rate
+        matrix[1][2] = (1.0, noisy_gamma)  # I => R
+
+        sir_model = epi.models.Model(1e6)
+        sir_model.add(susceptible, [1], matrix[0])
+        sir_model.add(infected, [2], matrix[1])
+        sir_model.add(removed, [], matrix[2])
+        sir_model.compile(custom=True)
+
+        epi.seed(7)
+        solutions.append(sir_model.integrate(range(50)))
+
+    assert np.array_equal(*solutions)
+
+def test_repeated():
+    """Repeated connections are equivalent to a single merged connection"""
+    solutions = []
+    for minimap, recovery in (([2, 2], (0.5, 0.2)), ([2], (1.0, 0.2))):
+        # compile model
+        susceptible = epi.comps.Susceptible(r_0, gamma, 1e6)
+        infected = epi.comps.Infected()
+        removed = epi.comps.Removed()
+
+        matrix = np.empty((3, 3), dtype=tuple)
+        matrix.fill((1.0, 1.0))  # default probability and rate
+        matrix[1][2] = recovery  # I => R
+
+        sir_model = epi.models.Model(1e6)
+        sir_model.add(susceptible, [1], matrix[0])
+        sir_model.add(infected, minimap, matrix[1])
+        sir_model.add(removed, [], matrix[2])
+        sir_model.compile()
+
+        solutions.append(sir_model.integrate(range(50)))
+
+        # compartment derivatives
+        system = np.array([9e5, 5e4, 5e4])
+        assert np.allclose(
+            epi.comps.Compartment.diff(0, system, 1, minimap, matrix[1]),
+            [0, -1e4, 1e4]
+        )
+
+    assert np.allclose(*solutions)
+
+def test_precision():
+    """Single-precision integration"""
+    sir_model = epi.pre.sir(r_0, gamma, 1e6)
+    double = sir_model.integrate(np.linspace(0, 20, 100))
+    single = sir_model.integrate(np.linspace(0, 20, 100), dtype=np.float32)
+
+    assert single.dtype == np.float32
+    assert double.dtype == np.float64
+    assert np.allclose(single, double, rtol=1e-4, atol=1)
+
+def test_shared():
+    """Compartments shared between models with different connections"""
+
+    class Custom(epi.comps.Removed):
+        def diff(self, time, system, pos, minimap, minimatrix):
+            return epi.comps.Compartment.diff(time, system, pos, minimap,
+                                              minimatrix)
+
+    infected = epi.comps.Infected()
+    system = np.array([900.0, 50.0, 50.0])
+
+    def build(rate):
+        matrix = np.empty((3, 3), dtype=tuple)
+        matrix.fill((1.0, 1.0))  # default probability and rate
+        matrix[1][2] = (1.0, rate)  # I => R
+
+        sir_model = epi.models.Model(1e3)
+        sir_model.add(epi.comps.Susceptible(2.0, 0.2, 1e3), [1], matrix[0])
+        sir_model.add(infected, [2], matrix[1])
+        sir_model.add(Custom(), [], matrix[2])
+        sir_model.compile(custom=True)
+        return sir_model
+
+    first = build(0.2)
+    before = first.diff(0, system)
+    build(0.9)
+    assert np.array_equal(first.diff(0, system), before)
+
+def test_parameters():
+    """Custom compartments with their own connection parameters"""
+
+    class Custom(epi.comps.Infected):
+        def diff(self, time, system, pos, minimap, minimatrix):
+            output = np.zeros(system.shape)
+            for connection in minimap:
+                deriv = minimatrix[connection]['rate'] * system[pos]
+                output[connection] += deriv
+                output[pos] -= deriv
+            return output
+
+    matrix = np.empty((3, 3), dtype=object)
+    matrix.fill((1.0, 1.0))  # default probability and rate
+    matrix[1][2] = {'rate': 0.2}  # I => R
+
+    sir_model = epi.models.Model(1e3)
+    sir_model.add(epi.comps.Susceptible(2.0, 0.2, 1e3), [1], matrix[0])
+    sir_model.add(Custom(), [2], matrix[1])
+    sir_model.add(epi.comps.Removed(), [], matrix[2])
+    sir_model.compile(custom=True)
+
+    assert np.allclose(sir_model.diff(0, np.array([900.0, 50.0, 50.0])),
+                       [-18, 8, 10])
@@ -0,0 +1,101 @@
+"""
+Test of the `analysis` subpackage in `epispot`
+(currently only the `normalize` module)
+
+STRUCTURE:
+├ GLOBALS
+    ├ deltas
+    └ deaths
+└ TESTS
+    ├ active
+    ├ cumulative
+    ├ recovered
+    ├ pipeline
+    ├ arrays
+    ├ overflow
+    └ batch
+"""
+
+import numpy as np
+
+import epispot as epi
+
+# GLOBALS
+deltas = [1, 3, 2, 5, 8, 4, 6, 0, 2, 7]
+deaths = [0, 0, 1, 0, 2, 1, 0, 3, 0, 1]
+
+
+# TESTS
+def test_active():
+    """Trailing sums of new cases (with and without testing delay)"""
+    normalize = epi.analysis.normalize
+    assert normalize.active(deltas, 3) == \
+        [1, 4, 6, 11, 18, 19, 23, 18, 12, 15]
+    assert normalize.active(deltas, 3, delay=1) == \
+        [4, 6, 11, 18, 19, 23, 18, 12, 15]
+    assert normalize.active(deltas, 5, delay=2) == \
+        [6, 11, 19, 23, 28, 25, 25, 27]
+
+def test_cumulative():
+    """Conversion between new and cumulative cases"""
+    normalize = epi.analysis.normalize
+    cumulative = normalize.cumulative(deltas)
+    assert cumulative == [1, 4, 6, 11, 19, 23, 29, 29, 31, 38]
+    assert normalize.deltas(cumulative) == deltas
+
+def test_recovered():
+    """Bounded deaths and recoveries from delayed data"""
+    normalize = epi.analysis.normalize
+    active = normalize.active(deltas, 3, delay=1)
+    delayed_deltas = normalize.shift(deltas, 1)
+    delayed_deaths = normalize.shift(deaths, 1)
+
+    bounded = normalize.bound(active, delayed_deltas, delayed_deaths)
+    assert bounded == [0, 0, 0, 1, 1, 0, 3, 0, 1]
+    assert normalize.recovered(active, delayed_deltas, bounded) == \
+        [0, 0, 0, 0, 2, 2, 2, 8, 3]
+
+    # a single day of data
+    assert normalize.recovered([38], [38], [0]) == [0]
+    assert [data.tolist() for data in normalize.pipeline([38], [0], 3)] == \
+        [[38], [0], [0]]
+
+def test_pipeline():
+    """Fused active/bound/recovered computation"""
+    normalize = epi.analysis.normalize
+    active, bounded, recovered = normalize.pipeline(deltas, deaths, 3, delay=1)
+    assert active.tolist() == normalize.active(deltas, 3, delay=1)
+    assert bounded.tolist() == [0, 0, 0, 1, 1, 0, 3, 0, 1]
+    assert recovered.tolist() == [0, 0, 0, 0, 2, 2, 2, 8, 3]
+
+def test_arrays():
+    """NumPy arrays in, NumPy arrays out"""
+    normalize = epi.analysis.normalize
+    active = normalize.active(np.array(deltas), 3, delay=1)
+    assert isinstance(active, np.ndarray)
+    assert active.tolist() == normalize.active(deltas, 3, delay=1)
+
+    bounded = normalize.bound(active, np.array(deltas[1:]), np.array(deaths[1:]))
+    assert isinstance(bounded, np.ndarray)
+    assert bounded.tolist() == [0, 0, 0, 1, 1, 0, 3, 0, 1]
+    assert isinstance(normalize.cumulative(np.array(deltas)), np.ndarray)
+    assert normalize.count([10, 20], 0.5) == [15.0, 30.0]
+
+def test_overflow():
+    """Integer counts are accumulated as int64"""
+    normalize = epi.analysis.normalize
+    large = np.full(10, 2 ** 30, dtype=np.int32)
+    assert normalize.cumulative(large)[-1] == 10 * 2 ** 30
+    assert normalize.active(large, 3)[-1] == 4 * 2 ** 30
+
+def test_batch():
+    """Normalization of many regions at once"""
+    normalize = epi.analysis.normalize
+    regions = np.array([deltas, deltas[::-1]])
+    active = normalize.active(regions, 3, delay=1)
+    assert active.shape == (2, 9)
+    assert active[0].tolist() == normalize.active(deltas, 3, delay=1)
+    assert active[1].tolist() == normalize.active(deltas[::-1], 3, delay=1)
+
+    _, bounded, _ = normalize.pipeline(regions, np.array([deaths, deaths]), 3, delay=1)
+    assert bounded[0].tolist() == [0, 0, 0, 1, 1, 0, 3, 0, 1]
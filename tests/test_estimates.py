@@ -4,9 +4,12 @@ Test of the `estimates` subpackage in `epispot`
 
 STRUCTURE:
 ├ santos
-└ bentout
+├ bentout
+└ edits
 """
 
+import copy
+
 import numpy as np
 
 import epispot as epi
@@ -59,3 +62,25 @@ def test_bentout():
     assert np.allclose(
         predicted, np.array([18050200, 7308800, 9223400, 9267600])
     )
+
+def test_edits():
+    """Queries reflect estimates changed after a previous query"""
+    disease = epi.estimates.getters.query('SARS-CoV-2')
+    paper = epi.estimates.getters.query('SARS-CoV-2/Santos 2022')
+
+    # a newer copy of the same paper takes precedence
+    revised = epi.estimates.utils.Paper(paper.id, paper.params)
+    disease.papers.insert(0, revised)
+    try:
+        assert epi.estimates.getters.query('SARS-CoV-2/Santos 2022') is revised
+    finally:
+        disease.papers.remove(revised)
+
+    # diseases added to `storage.bulk` directly can be queried too
+    custom = copy.copy(disease)
+    custom.id = 'SARS-CoV-2 (custom)'
+    epi.estimates.storage.bulk.append(custom)
+    try:
+        assert epi.estimates.getters.query('SARS-CoV-2 (custom)') is custom
+    finally:
+        epi.estimates.storage.bulk.remove(custom)
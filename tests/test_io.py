@@ -4,11 +4,13 @@ Test epispot's ability to load and save models:
 2. Loads the model from the file and checks that the model is correct.
 
 STRUCTURE:
-└ main
+├ main
+└ legacy
 """
 
 from os import mkdir, path
 
+import dill
 import numpy as np
 
 import epispot as epi
@@ -56,3 +58,29 @@ def test_main():
     re_solution = loaded.integrate(np.linspace(0, 20, 100))
     re_predicted = re_solution[99]
     assert np.allclose(predicted, re_predicted)
+
+
+def test_legacy():
+    """SIR Model saved without any compile-time caches"""
+
+    # compile model
+    sir_model = epi.pre.sir(lambda t: 2.5, lambda t: 0.2, 1e6)
+    system = np.array([9e5, 5e4, 5e4])
+    derivative = sir_model.diff(0, system)
+
+    # strip caches (as in models saved by older versions of epispot)
+    for cache in ('_options', '_projections', '_cached', '_caches',
+                  '_network', '_accumulate'):
+        vars(sir_model).pop(cache, None)
+
+    # save model
+    if not path.exists('tests/artifacts'):
+        mkdir('tests/artifacts')
+    with open('tests/artifacts/SIR_Model_Legacy.epi', 'wb') as f:
+        dill.dump(sir_model, f)
+
+    # load model
+    loaded = epi.models.Model.load('tests/artifacts/SIR_Model_Legacy.epi')
+
+    # check model (`diff` relies on the caches being rebuilt by `load`)
+    assert np.array_equal(derivative, loaded.diff(0, system))